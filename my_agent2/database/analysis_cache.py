@@ -0,0 +1,70 @@
+"""
+Time-bucketed caching for the dashboard agents' analysis tools.
+
+Analyses are memoized per argument tuple for one time bucket, so repeated
+tool calls within a conversation reuse the result instead of re-fetching
+from the REST API, while changes made elsewhere show up within one TTL.
+"""
+
+import time
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from typing import Any
+
+
+# Analysis results are reused for this many seconds per listing
+ANALYSIS_CACHE_TTL_SECONDS = 60
+
+
+@dataclass(frozen=True, slots=True)
+class Uncached:
+    """
+    Result to hand back once without caching it.
+
+    Use it for results built from missing or failed data (an unknown
+    listing, a request that errored) so the next call fetches again
+    instead of replaying the failure for the rest of the time bucket.
+    """
+    value: Any
+
+
+class _UncachedResult(Exception):
+    """Carries an Uncached value out of lru_cache, which never stores raises."""
+
+    def __init__(self, value: Any):
+        super().__init__()
+        self.value = value
+
+
+def time_bucketed_cache(maxsize: int = 256, ttl_seconds: int = ANALYSIS_CACHE_TTL_SECONDS):
+    """
+    Memoize a function per argument tuple for one time bucket.
+
+    Cached results are shared between callers, so they should be immutable
+    or copied before being handed out. A function returns Uncached(value)
+    to have value passed through without being cached. The wrapper exposes
+    cache_clear() for callers that know the underlying data changed.
+
+    :param maxsize: Maximum number of results kept across all buckets
+    :param ttl_seconds: Length of a time bucket in seconds
+    :return: Decorator for the analysis function
+    """
+    def decorator(func):
+        @lru_cache(maxsize=maxsize)
+        def cached(time_bucket, *args):
+            result = func(*args)
+            if isinstance(result, Uncached):
+                raise _UncachedResult(result.value)
+            return result
+
+        @wraps(func)
+        def wrapper(*args):
+            try:
+                return cached(int(time.time() // ttl_seconds), *args)
+            except _UncachedResult as uncached:
+                return uncached.value
+
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+
+    return decorator
@@ -6,16 +6,29 @@ REST API at localhost:3000 instead of direct PostgreSQL connection.
 """
 
 import os
+import sys
 import httpx
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 
 # Base URL for the iShare API
 API_BASE_URL = os.getenv("ISHARE_API_URL", "http://localhost:3000")
 
 
+def _intern_type(listing_type: Optional[str]) -> str:
+    """
+    Intern a listing type so repeated values share one string object.
+
+    Listing types are a small closed set used as dict keys and compared
+    across the whole catalog; interning lets those lookups hit the
+    identity fast path instead of re-comparing fresh strings.
+    """
+    return sys.intern(listing_type) if listing_type else ""
+
+
 @dataclass
 class Booking:
     """Booking data model matching database schema."""
@@ -45,6 +58,11 @@ class Review:
     comment: str
     timestamp: datetime
     flagged: bool = False
+    # Lowercased comment for keyword matching, derived once on creation
+    comment_lower: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.comment_lower = (self.comment or "").lower()
 
 
 @dataclass
@@ -73,6 +91,9 @@ class APIDatabase:
         self.base_url = base_url or API_BASE_URL
         self._client = httpx.Client(timeout=30.0)
         
+        # Worker threads for issuing independent API requests concurrently
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="api-db")
+        
         # Cache for discount percent (temporary storage)
         self._discount_cache: Dict[str, float] = {}
 
@@ -106,6 +127,16 @@ class APIDatabase:
             print(f"API Error: {e}")
             return None
 
+    def _fetch_concurrently(self, first, second) -> Tuple[Any, Any]:
+        """
+        Run two independent fetches at the same time.
+        
+        The second fetch runs on the worker pool while the first runs in the
+        calling thread, so the total latency is that of the slower request.
+        """
+        future = self._executor.submit(second)
+        return first(), future.result()
+
     def get_listing(self, listing_id: str) -> Optional[Listing]:
         """
         Retrieve a listing by ID.
@@ -128,7 +159,7 @@ class APIDatabase:
             basePrice=base_price,
             pricePerDay=base_price,  # Use basePrice as pricePerDay
             status=data.get("status", ""),
-            type=data.get("type", ""),
+            type=_intern_type(data.get("type")),
             images=data.get("images", []),
             discountPercent=self._discount_cache.get(listing_id, 0.0)
         )
@@ -151,7 +182,7 @@ class APIDatabase:
                 basePrice=base_price,
                 pricePerDay=base_price,
                 status=item.get("status", ""),
-                type=item.get("type", ""),
+                type=_intern_type(item.get("type")),
                 images=item.get("images", []),
                 discountPercent=self._discount_cache.get(item.get("id", ""), 0.0)
             ))
@@ -169,10 +200,22 @@ class APIDatabase:
         :param listing_id: UUID of the listing
         :return: List of Booking objects
         """
+        return self._fetch_bookings(listing_id) or []
+
+    def _fetch_bookings(self, listing_id: str) -> Optional[List[Booking]]:
+        """
+        Retrieve all bookings for a listing, or None if the request failed.
+        
+        Unlike get_bookings, a failed request is kept apart from a listing
+        that simply has no bookings, so callers can avoid caching it.
+        """
         # Get ALL bookings and filter client-side
         # (API's ?listingId= filter doesn't work properly)
         data = self._get(f"/bookings")
         
+        if data is None:
+            return None
+        
         if data:
             # Filter by listing_id - check nested listing object or direct field
             data = [b for b in data if 
@@ -232,6 +275,25 @@ class APIDatabase:
         
         return bookings
 
+    def get_listing_with_bookings(self, listing_id: str) -> Tuple[Optional[Listing], Optional[List[Booking]]]:
+        """
+        Retrieve a listing together with its bookings.
+        
+        The listing is fetched first, and bookings only when it exists:
+        /bookings returns every booking in the system, so unknown listing
+        IDs should not pay for that download. (Reviews are scoped per
+        listing, which is why get_listing_with_reviews runs concurrently.)
+        
+        :param listing_id: UUID of the listing
+        :return: Tuple of (Listing or None, list of Booking objects or
+            None if the bookings request failed)
+        """
+        listing = self.get_listing(listing_id)
+        if not listing:
+            return None, []
+        
+        return listing, self._fetch_bookings(listing_id)
+
     def get_all_bookings(self) -> List[Booking]:
         """
         Retrieve ALL bookings from the database.
@@ -303,9 +365,21 @@ class APIDatabase:
         :param listing_id: UUID of the listing
         :return: List of Review objects
         """
+        return self._fetch_reviews(listing_id) or []
+
+    def _fetch_reviews(self, listing_id: str) -> Optional[List[Review]]:
+        """
+        Retrieve all reviews for a listing, or None if the request failed.
+        
+        Unlike get_reviews, a failed request is kept apart from a listing
+        that simply has no reviews, so callers can avoid caching it.
+        """
         # Get reviews for this listing using the correct endpoint
         data = self._get(f"/reviews/listing/{listing_id}")
         
+        if data is None:
+            return None
+        
         if not data:
             return []
         
@@ -352,6 +426,21 @@ class APIDatabase:
         
         return reviews
 
+    def get_listing_with_reviews(self, listing_id: str) -> Tuple[Optional[Listing], Optional[List[Review]]]:
+        """
+        Retrieve a listing together with its reviews.
+        
+        Both requests are issued concurrently.
+        
+        :param listing_id: UUID of the listing
+        :return: Tuple of (Listing or None, list of Review objects or
+            None if the reviews request failed)
+        """
+        return self._fetch_concurrently(
+            lambda: self.get_listing(listing_id),
+            lambda: self._fetch_reviews(listing_id)
+        )
+
     def get_user(self, user_id: int) -> Optional[Dict]:
         """Get user by ID."""
         data = self._get(f"/users/{user_id}")
@@ -381,7 +470,7 @@ class APIDatabase:
                 basePrice=base_price,
                 pricePerDay=base_price,
                 status=item.get("status", ""),
-                type=item.get("type", ""),
+                type=_intern_type(item.get("type")),
                 images=item.get("images", []),
                 discountPercent=self._discount_cache.get(item.get("id", ""), 0.0)
             ))
@@ -447,7 +536,8 @@ class APIDatabase:
         }
 
     def close(self):
-        """Close the HTTP client."""
+        """Shut down the worker threads and close the HTTP client."""
+        self._executor.shutdown(wait=True)
         self._client.close()
 
 
@@ -1,5 +1,3 @@
-from google.adk.agents import LlmAgent
-
 """
 Demand Trend Agent for the analytics dashboard.
 
@@ -11,11 +9,25 @@ This agent analyzes market trends to help owners understand:
 This is a READ-ONLY advisory agent.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any
 from collections import defaultdict
+from dataclasses import dataclass
+
+from google.adk.agents import LlmAgent
 
 from ..database.api_db import api_db as db
 
+# Booking statuses that count towards revenue and completed bookings
+PAID_STATUSES = frozenset({"CONFIRMED", "COMPLETED"})
+
+
+@dataclass(slots=True)
+class TypeStats:
+    """Running market totals for a single listing type."""
+    count: int = 0
+    total_bookings: int = 0
+    total_revenue: float = 0.0
+
 
 def analyze_market_trends(owner_id: int) -> Dict[str, Any]:
     """
@@ -49,44 +61,44 @@ def analyze_market_trends(owner_id: int) -> Dict[str, Any]:
     # Get ALL bookings once (more efficient than calling per listing)
     all_bookings = db.get_all_bookings()
     
-    # Group bookings by listing ID for quick lookup
-    bookings_by_listing: Dict[str, List] = defaultdict(list)
+    # Reduce bookings to per-listing columns in a single pass so the loops
+    # below only read a few scalars instead of walking Booking objects
+    booking_counts: Dict[str, int] = defaultdict(int)
+    paid_counts: Dict[str, int] = defaultdict(int)
+    paid_revenue: Dict[str, float] = defaultdict(float)
     for booking in all_bookings:
-        bookings_by_listing[booking.listingId].append(booking)
+        listing_id = booking.listingId
+        booking_counts[listing_id] += 1
+        if booking.status in PAID_STATUSES:
+            paid_counts[listing_id] += 1
+            paid_revenue[listing_id] += float(booking.totalPrice)
     
     # Analyze market by listing type
-    type_stats = defaultdict(lambda: {
-        "count": 0,
-        "total_bookings": 0,
-        "total_revenue": 0.0,
-        "listings": []
-    })
+    type_stats: Dict[str, TypeStats] = {}
     
     for listing in all_listings:
         listing_type = listing.type or "Other"
-        type_stats[listing_type]["count"] += 1
-        type_stats[listing_type]["listings"].append(listing)
-        
-        # Get bookings for this listing from our pre-fetched data
-        listing_bookings = bookings_by_listing.get(listing.listingId, [])
-        type_stats[listing_type]["total_bookings"] += len(listing_bookings)
+        stats = type_stats.get(listing_type)
+        if stats is None:
+            stats = type_stats[listing_type] = TypeStats()
+        stats.count += 1
         
-        for booking in listing_bookings:
-            if booking.status in ["CONFIRMED", "COMPLETED"]:
-                type_stats[listing_type]["total_revenue"] += float(booking.totalPrice)
+        # Get bookings for this listing from our pre-aggregated data
+        stats.total_bookings += booking_counts.get(listing.listingId, 0)
+        stats.total_revenue += paid_revenue.get(listing.listingId, 0.0)
     
     # Calculate trends
     trending_types = []
     for listing_type, stats in type_stats.items():
-        if stats["count"] > 0:
+        if stats.count > 0:
             # Calculate trend score (higher = more trending)
-            avg_bookings = stats["total_bookings"] / stats["count"]
-            avg_revenue = stats["total_revenue"] / stats["count"]
+            avg_bookings = stats.total_bookings / stats.count
+            avg_revenue = stats.total_revenue / stats.count
             trend_score = (avg_bookings * 2) + (avg_revenue / 100)
             
             trending_types.append({
                 "type": listing_type,
-                "listing_count": stats["count"],
+                "listing_count": stats.count,
                 "trend_score": round(trend_score, 2)
             })
     
@@ -103,17 +115,14 @@ def analyze_market_trends(owner_id: int) -> Dict[str, Any]:
     
     for listing in owner_listings:
         owner_types.add(listing.type or "Other")
-        listing_bookings = bookings_by_listing.get(listing.listingId, [])
-        booking_count = len([b for b in listing_bookings if b.status in ["CONFIRMED", "COMPLETED"]])
+        booking_count = paid_counts.get(listing.listingId, 0)
         owner_listings_with_bookings[listing.listingId] = {
             "type": listing.type,
             "title": listing.title,
             "bookings": booking_count
         }
         owner_bookings += booking_count
-        for booking in listing_bookings:
-            if booking.status in ["CONFIRMED", "COMPLETED"]:
-                owner_revenue += float(booking.totalPrice)
+        owner_revenue += paid_revenue.get(listing.listingId, 0.0)
     
     # Generate priority recommendations
     recommendations = []
@@ -185,29 +194,32 @@ def analyze_market_trends(owner_id: int) -> Dict[str, Any]:
     }
 
 
+# Prompt for the DemandTrendAgent
+DEMAND_INSTRUCTION = (
+    "You are a market trend analyst for peer-to-peer rentals. Your role is to help owners understand market demand and make strategic decisions.\n\n"
+    "When responding to a query:\n"
+    "1. If the owner ID is not clear, politely ask the user to provide it.\n"
+    "2. Use the `analyze_market_trends` tool to get market analysis.\n"
+    "3. Return the results in JSON format.\n\n"
+    "IMPORTANT: This is a read-only advisory agent. You provide insights and recommendations, "
+    "but you cannot make changes to listings or the database.\n\n"
+    "OUTPUT FORMAT: You MUST respond with ONLY valid JSON, no markdown formatting, no code blocks, no extra text.\n"
+    "Return the exact JSON structure from the tool result:\n"
+    "{\n"
+    '  "title": "Market Trend Analysis",\n'
+    '  "portfolio": { "total_listings": <n>, "types": [...], "total_bookings": <n>, "total_revenue": <n> },\n'
+    '  "trending_types": [{ "type": "...", "listing_count": <n>, "total_bookings": <n>, "total_revenue": <n>, "trend_score": <n> }],\n'
+    '  "recommendations": [{ "type": "...", "status": "...", "message": "...", "advice": "..." }],\n'
+    '  "message": "Market trend analysis complete."\n'
+    "}"
+)
+
 # Create the DemandTrendAgent LLM agent
 demand_agent = LlmAgent(
     model="gemini-2.5-flash",
     name="DemandTrendAgent",
     description="Analyzes market trends to identify trending listing types and provides priority recommendations.",
-    instruction=(
-        "You are a market trend analyst for peer-to-peer rentals. Your role is to help owners understand market demand and make strategic decisions.\n\n"
-        "When responding to a query:\n"
-        "1. If the owner ID is not clear, politely ask the user to provide it.\n"
-        "2. Use the `analyze_market_trends` tool to get market analysis.\n"
-        "3. Return the results in JSON format.\n\n"
-        "IMPORTANT: This is a read-only advisory agent. You provide insights and recommendations, "
-        "but you cannot make changes to listings or the database.\n\n"
-        "OUTPUT FORMAT: You MUST respond with ONLY valid JSON, no markdown formatting, no code blocks, no extra text.\n"
-        "Return the exact JSON structure from the tool result:\n"
-        "{\n"
-        '  "title": "Market Trend Analysis",\n'
-        '  "portfolio": { "total_listings": <n>, "types": [...], "total_bookings": <n>, "total_revenue": <n> },\n'
-        '  "trending_types": [{ "type": "...", "listing_count": <n>, "total_bookings": <n>, "total_revenue": <n>, "trend_score": <n> }],\n'
-        '  "recommendations": [{ "type": "...", "status": "...", "message": "...", "advice": "..." }],\n'
-        '  "message": "Market trend analysis complete."\n'
-        "}"
-    ),
+    instruction=DEMAND_INSTRUCTION,
     tools=[analyze_market_trends],
 )
 
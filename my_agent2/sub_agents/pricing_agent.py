@@ -10,15 +10,90 @@ This agent handles dynamic pricing recommendations:
 - Can take action to update prices when user clicks "Take Action"
 """
 
-from typing import Dict, Any
-from datetime import datetime, timedelta
+from typing import Dict, Any, List, Union
+from dataclasses import dataclass, asdict
+from datetime import date, datetime
 from zoneinfo import ZoneInfo
 
 from ..database.api_db import api_db as db
+from ..database.analysis_cache import Uncached, time_bucketed_cache
 
 # Malaysia timezone
 MALAYSIA_TZ = ZoneInfo("Asia/Kuala_Lumpur")
 
+# Malaysian Public Holidays 2026 (with buffer days for travel)
+# Format: (start_date, end_date, holiday_name) - both dates inclusive
+MALAYSIAN_HOLIDAYS_2026 = (
+    (date(2026, 1, 1), date(2026, 1, 2), "New Year"),
+    (date(2026, 1, 14), date(2026, 1, 15), "Thaipusam"),
+    (date(2026, 2, 1), date(2026, 2, 2), "Federal Territory Day"),
+    (date(2026, 2, 17), date(2026, 2, 20), "Chinese New Year"),
+    (date(2026, 3, 20), date(2026, 3, 23), "Hari Raya Aidilfitri"),
+    (date(2026, 5, 1), date(2026, 5, 2), "Labour Day"),
+    (date(2026, 5, 12), date(2026, 5, 13), "Wesak Day"),
+    (date(2026, 5, 27), date(2026, 5, 30), "Hari Raya Haji"),
+    (date(2026, 6, 1), date(2026, 6, 2), "Agong Birthday"),
+    (date(2026, 6, 17), date(2026, 6, 18), "Awal Muharram"),
+    (date(2026, 8, 26), date(2026, 8, 27), "Maulidur Rasul"),
+    (date(2026, 8, 31), date(2026, 9, 1), "Merdeka Day"),
+    (date(2026, 9, 16), date(2026, 9, 17), "Malaysia Day"),
+    (date(2026, 11, 8), date(2026, 11, 9), "Deepavali"),
+    (date(2026, 12, 25), date(2026, 12, 26), "Christmas"),
+)
+
+# School holidays in Malaysia 2026 (approximate)
+# Format: (start_date, end_date, holiday_name) - both dates inclusive
+SCHOOL_HOLIDAYS_2026 = (
+    (date(2026, 3, 13), date(2026, 3, 22), "March School Holiday"),
+    (date(2026, 5, 23), date(2026, 6, 7), "Mid-Year School Holiday"),
+    (date(2026, 8, 15), date(2026, 8, 23), "August School Holiday"),
+    (date(2026, 11, 21), date(2026, 12, 31), "Year-End School Holiday"),
+)
+
+
+def _expand_holidays(holidays) -> Dict[int, str]:
+    """Expand (start, end, name) ranges into a day ordinal -> holiday name lookup."""
+    days: Dict[int, str] = {}
+    for start, end, name in holidays:
+        for ordinal in range(start.toordinal(), end.toordinal() + 1):
+            days.setdefault(ordinal, name)
+    return days
+
+
+# The calendar is fixed, so resolve it once at import instead of
+# re-checking every range for each booking. Keys are date ordinals, which
+# datetime.toordinal() yields without building an intermediate date.
+_HOLIDAY_BY_ORDINAL = _expand_holidays(MALAYSIAN_HOLIDAYS_2026)
+_SCHOOL_HOLIDAY_ORDINALS = frozenset(_expand_holidays(SCHOOL_HOLIDAYS_2026))
+
+# Messages returned by apply_price_change
+LISTING_NOT_FOUND_MESSAGE = "Listing '{listing_id}' not found."
+PRICE_UPDATED_MESSAGE = "✅ Price updated successfully for '{title}' from ${old:.2f} to ${new:.2f}."
+PRICE_UPDATE_FAILED_MESSAGE = "Failed to update price."
+BOOKINGS_UNAVAILABLE_MESSAGE = "Could not load bookings for '{title}'. Please try again shortly."
+
+# Fixed recommendation for listings that have never been booked
+NO_BOOKINGS_ADJUSTMENT_PERCENT = -10.0
+NO_BOOKINGS_REASONS = (
+    "Low booking activity detected",
+    "Price reduction may attract more renters",
+    "Current occupancy: 0%",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PricingResult:
+    """Pricing recommendation for a listing, in the order it is reported."""
+    title: str
+    current_price: float
+    suggested_price: float
+    price_difference: float
+    adjustment_percent: float
+    adjustment_direction: str
+    demand_level: str
+    reasons: List[str]
+    can_take_action: bool
+
 
 def analyze_pricing(listing_id: str) -> Dict[str, Any]:
     """
@@ -33,140 +108,119 @@ def analyze_pricing(listing_id: str) -> Dict[str, Any]:
     :param listing_id: Identifier of the listing to analyze
     :return: Dictionary with pricing analysis and recommendations
     """
-    bookings = db.get_bookings(listing_id)
-    listing = db.get_listing(listing_id)
+    result = _analyze_pricing_cached(listing_id)
     
+    # Error dicts are built per call; cached results are shared, so copy them
+    return asdict(result) if isinstance(result, PricingResult) else result
+
+
+@time_bucketed_cache()
+def _analyze_pricing_cached(listing_id: str) -> Union[PricingResult, Uncached]:
+    """Build the pricing recommendation; errors are returned uncached."""
+    listing, bookings = db.get_listing_with_bookings(listing_id)
+    
+    # The listing may be new or the request may have failed, so look again
+    # on the next call rather than reporting it missing for a whole bucket
     if not listing:
-        return {
+        return Uncached({
             "listing_id": listing_id,
             "error": True,
-            "message": f"Listing '{listing_id}' not found."
-        }
+            "message": LISTING_NOT_FOUND_MESSAGE.format(listing_id=listing_id)
+        })
     
     listing_title = listing.title
+    
+    # A failed bookings request must not read as "no bookings", which would
+    # recommend a price cut
+    if bookings is None:
+        return Uncached({
+            "listing_id": listing_id,
+            "error": True,
+            "message": BOOKINGS_UNAVAILABLE_MESSAGE.format(title=listing_title)
+        })
+    
     current_price = float(listing.pricePerDay) if hasattr(listing, 'pricePerDay') else float(listing.basePrice)
     
+    # A listing with no bookings always scores zero demand, so skip the
+    # analysis and return the "Very Low" recommendation directly
+    if not bookings:
+        suggested_price = current_price * (1 + NO_BOOKINGS_ADJUSTMENT_PERCENT / 100)
+        return PricingResult(
+            title=f"Pricing Analysis for '{listing_title}'",
+            current_price=current_price,
+            suggested_price=round(suggested_price, 2),
+            price_difference=round(suggested_price - current_price, 2),
+            adjustment_percent=NO_BOOKINGS_ADJUSTMENT_PERCENT,
+            adjustment_direction="decrease",
+            demand_level="Very Low",
+            reasons=list(NO_BOOKINGS_REASONS),
+            can_take_action=True
+        )
+    
     # Analyze booking patterns
-    total_bookings = len(bookings)
     weekend_bookings = 0
     weekday_bookings = 0
-    total_days_booked = 0
-    total_revenue = 0.0
-    
-    # Malaysian Public Holidays 2026 (with buffer days for travel)
-    # Format: (start_date, end_date, holiday_name)
-    malaysian_holidays = [
-        (datetime(2026, 1, 1), datetime(2026, 1, 2), "New Year"),
-        (datetime(2026, 1, 14), datetime(2026, 1, 15), "Thaipusam"),
-        (datetime(2026, 2, 1), datetime(2026, 2, 2), "Federal Territory Day"),
-        (datetime(2026, 2, 17), datetime(2026, 2, 20), "Chinese New Year"),
-        (datetime(2026, 3, 20), datetime(2026, 3, 23), "Hari Raya Aidilfitri"),
-        (datetime(2026, 5, 1), datetime(2026, 5, 2), "Labour Day"),
-        (datetime(2026, 5, 12), datetime(2026, 5, 13), "Wesak Day"),
-        (datetime(2026, 5, 27), datetime(2026, 5, 30), "Hari Raya Haji"),
-        (datetime(2026, 6, 1), datetime(2026, 6, 2), "Agong Birthday"),
-        (datetime(2026, 6, 17), datetime(2026, 6, 18), "Awal Muharram"),
-        (datetime(2026, 8, 26), datetime(2026, 8, 27), "Maulidur Rasul"),
-        (datetime(2026, 8, 31), datetime(2026, 9, 1), "Merdeka Day"),
-        (datetime(2026, 9, 16), datetime(2026, 9, 17), "Malaysia Day"),
-        (datetime(2026, 11, 8), datetime(2026, 11, 9), "Deepavali"),
-        (datetime(2026, 12, 25), datetime(2026, 12, 26), "Christmas"),
-    ]
-    
-    # School holidays in Malaysia 2026 (approximate)
-    school_holidays = [
-        (datetime(2026, 3, 13), datetime(2026, 3, 22), "March School Holiday"),
-        (datetime(2026, 5, 23), datetime(2026, 6, 7), "Mid-Year School Holiday"),
-        (datetime(2026, 8, 15), datetime(2026, 8, 23), "August School Holiday"),
-        (datetime(2026, 11, 21), datetime(2026, 12, 31), "Year-End School Holiday"),
-    ]
-    
     holiday_bookings = 0
     school_holiday_bookings = 0
-    matched_holidays = []
+    matched_holidays: Dict[str, None] = {}  # Insertion-ordered set of holiday names
     recent_bookings = 0  # Last 30 days
     recent_days_booked = 0  # Days booked in last 30 days (for occupancy)
     
-    # Get current time in Malaysia timezone
-    now = datetime.now(MALAYSIA_TZ).replace(tzinfo=None)
-    thirty_days_ago = now - timedelta(days=30)
+    # Get current day in Malaysia timezone; the 30-day window is tracked
+    # in day ordinals so the loop only does integer arithmetic
+    today_ordinal = datetime.now(MALAYSIA_TZ).toordinal()
+    window_start_ordinal = today_ordinal - 30
+    
+    # Bind loop-invariant globals to locals for the per-booking loop
+    holiday_for_ordinal = _HOLIDAY_BY_ORDINAL.get
+    school_holiday_ordinals = _SCHOOL_HOLIDAY_ORDINALS
     
     for booking in bookings:
-        days = max((booking.endDate - booking.startDate).days, 0)
-        total_days_booked += days
-        
-        if booking.status == "CONFIRMED":
-            total_revenue += float(booking.totalPrice)
+        # Read the start day straight off the datetime; the ordinal is
+        # shared by the holiday checks and the 30-day window below
+        start_date = booking.startDate
+        start_ordinal = start_date.toordinal()
         
         # Check if weekend booking
-        start_weekday = booking.startDate.weekday()
-        if start_weekday >= 5:  # Saturday=5, Sunday=6
+        if start_date.weekday() >= 5:  # Saturday=5, Sunday=6
             weekend_bookings += 1
         else:
             weekday_bookings += 1
         
         # Check if Malaysian public holiday booking
-        booking_start = booking.startDate.replace(tzinfo=None)
-        booking_end = booking.endDate.replace(tzinfo=None)
-        
-        for holiday_start, holiday_end, holiday_name in malaysian_holidays:
-            if holiday_start <= booking_start <= holiday_end:
-                holiday_bookings += 1
-                if holiday_name not in matched_holidays:
-                    matched_holidays.append(holiday_name)
-                break
+        holiday_name = holiday_for_ordinal(start_ordinal)
+        if holiday_name is not None:
+            holiday_bookings += 1
+            matched_holidays[holiday_name] = None
         
         # Check if school holiday booking
-        for school_start, school_end, school_name in school_holidays:
-            if school_start <= booking_start <= school_end:
-                school_holiday_bookings += 1
-                break
+        if start_ordinal in school_holiday_ordinals:
+            school_holiday_bookings += 1
         
         # Check if recent booking (within last 30 days)
-        if booking_start >= thirty_days_ago:
+        if start_ordinal >= window_start_ordinal:
             recent_bookings += 1
             # Calculate days booked within the 30-day window
-            overlap_start = max(booking_start, thirty_days_ago)
-            overlap_end = min(booking_end, now)
-            if overlap_end > overlap_start:
-                recent_days_booked += (overlap_end - overlap_start).days
+            overlap_end = min(booking.endDate.toordinal(), today_ordinal)
+            if overlap_end > start_ordinal:
+                recent_days_booked += overlap_end - start_ordinal
     
     # Calculate occupancy rate (last 30 days only)
     # Days booked in last 30 days / 30 days
     occupancy_rate = min(recent_days_booked / 30.0, 1.0) if recent_days_booked > 0 else 0.0
     
-    # Calculate conversion rate (bookings per view - simplified as bookings/10)
-    conversion_rate = min(total_bookings / 10.0, 1.0) if total_bookings > 0 else 0.0
-    
     # Determine demand level
-    demand_indicators = []
-    demand_score = 0
-    
-    if occupancy_rate >= 0.7:
-        demand_score += 3
-        demand_indicators.append("High occupancy rate (≥70%)")
-    elif occupancy_rate >= 0.4:
-        demand_score += 1
-        demand_indicators.append("Moderate occupancy rate")
-    
-    if weekend_bookings > weekday_bookings:
-        demand_score += 1
-        demand_indicators.append("Strong weekend demand")
-    
-    if holiday_bookings > 0:
-        demand_score += 2
-        demand_indicators.append(f"{holiday_bookings} public holiday bookings ({', '.join(matched_holidays[:2])})")
-    
-    if school_holiday_bookings > 0:
-        demand_score += 1
-        demand_indicators.append(f"{school_holiday_bookings} school holiday bookings")
-    
-    if recent_bookings >= 3:
-        demand_score += 2
-        demand_indicators.append("Strong recent booking activity")
-    elif recent_bookings >= 1:
-        demand_score += 1
-        demand_indicators.append("Some recent booking activity")
+    # Each rule: (applies, score weight, indicator reported with an increase)
+    demand_rules = (
+        (occupancy_rate >= 0.7, 3, "High occupancy rate (≥70%)"),
+        (0.4 <= occupancy_rate < 0.7, 1, "Moderate occupancy rate"),
+        (weekend_bookings > weekday_bookings, 1, "Strong weekend demand"),
+        (holiday_bookings > 0, 2, f"{holiday_bookings} public holiday bookings ({', '.join(list(matched_holidays)[:2])})"),
+        (school_holiday_bookings > 0, 1, f"{school_holiday_bookings} school holiday bookings"),
+        (recent_bookings >= 3, 2, "Strong recent booking activity"),
+        (1 <= recent_bookings < 3, 1, "Some recent booking activity"),
+    )
+    demand_score = sum(weight for applies, weight, _ in demand_rules if applies)
     
     # Determine recommendation
     if demand_score >= 5:
@@ -194,7 +248,7 @@ def analyze_pricing(listing_id: str) -> Dict[str, Any]:
     reasons = []
     if adjustment_direction == "increase":
         reasons.append(f"Demand level is {demand_level}")
-        reasons.extend(demand_indicators)
+        reasons.extend(indicator for applies, _, indicator in demand_rules if applies)
         reasons.append(f"Current occupancy: {occupancy_rate*100:.0f}%")
     elif adjustment_direction == "decrease":
         reasons.append("Low booking activity detected")
@@ -204,18 +258,17 @@ def analyze_pricing(listing_id: str) -> Dict[str, Any]:
         reasons.append("Current pricing appears optimal for demand level")
         reasons.append(f"Occupancy rate: {occupancy_rate*100:.0f}%")
     
-    # Return clean JSON structure
-    return {
-        "title": f"Pricing Analysis for '{listing_title}'",
-        "current_price": current_price,
-        "suggested_price": round(suggested_price, 2),
-        "price_difference": round(price_difference, 2),
-        "adjustment_percent": adjustment_percent,
-        "adjustment_direction": adjustment_direction,
-        "demand_level": demand_level,
-        "reasons": reasons,
-        "can_take_action": adjustment_percent != 0
-    }
+    return PricingResult(
+        title=f"Pricing Analysis for '{listing_title}'",
+        current_price=current_price,
+        suggested_price=round(suggested_price, 2),
+        price_difference=round(price_difference, 2),
+        adjustment_percent=adjustment_percent,
+        adjustment_direction=adjustment_direction,
+        demand_level=demand_level,
+        reasons=reasons,
+        can_take_action=adjustment_percent != 0
+    )
 
 
 def apply_price_change(listing_id: str, new_price: float) -> Dict[str, Any]:
@@ -232,7 +285,7 @@ def apply_price_change(listing_id: str, new_price: float) -> Dict[str, Any]:
     if not listing:
         return {
             "success": False,
-            "message": f"Listing '{listing_id}' not found."
+            "message": LISTING_NOT_FOUND_MESSAGE.format(listing_id=listing_id)
         }
     
     old_price = float(listing.pricePerDay) if hasattr(listing, 'pricePerDay') else float(listing.basePrice)
@@ -247,38 +300,43 @@ def apply_price_change(listing_id: str, new_price: float) -> Dict[str, Any]:
     result = db.update_listing_price(listing_id, percent_change)
     
     if result.get("status") == "success":
+        # The stored price changed, so cached pricing analyses are stale
+        _analyze_pricing_cached.cache_clear()
         return {
             "success": True,
             "listing_id": listing_id,
             "listing_title": listing.title,
             "old_price": old_price,
             "new_price": new_price,
-            "message": f"✅ Price updated successfully for '{listing.title}' from ${old_price:.2f} to ${new_price:.2f}."
+            "message": PRICE_UPDATED_MESSAGE.format(title=listing.title, old=old_price, new=new_price)
         }
     else:
         return {
             "success": False,
-            "message": result.get("message", "Failed to update price.")
+            "message": result.get("message", PRICE_UPDATE_FAILED_MESSAGE)
         }
 
 
+# Prompt for the PricingAgent
+PRICING_INSTRUCTION = (
+    "You are a dynamic pricing specialist for peer-to-peer rentals.\n\n"
+    "When responding to a query:\n"
+    "1. If the listing ID is not provided, ask the user for it.\n"
+    "2. Use the `analyze_pricing` tool to get pricing analysis.\n"
+    "3. Return ONLY the JSON object from the tool result - do not wrap it in another object.\n"
+    "4. Do not add any text before or after the JSON.\n"
+    "5. Do not use markdown code blocks.\n\n"
+    "ACTION CAPABILITY:\n"
+    "When the user wants to apply the price change, use the `apply_price_change` tool "
+    "with the listing_id and the suggested new_price to update the database.\n\n"
+    "Return the tool result as-is in JSON format."
+)
+
 # Create the PricingAgent LLM agent
 pricing_agent = LlmAgent(
     model="gemini-2.5-flash",
     name="PricingAgent",
     description="Analyzes demand patterns and provides dynamic pricing recommendations in JSON format.",
-    instruction=(
-        "You are a dynamic pricing specialist for peer-to-peer rentals.\n\n"
-        "When responding to a query:\n"
-        "1. If the listing ID is not provided, ask the user for it.\n"
-        "2. Use the `analyze_pricing` tool to get pricing analysis.\n"
-        "3. Return ONLY the JSON object from the tool result - do not wrap it in another object.\n"
-        "4. Do not add any text before or after the JSON.\n"
-        "5. Do not use markdown code blocks.\n\n"
-        "ACTION CAPABILITY:\n"
-        "When the user wants to apply the price change, use the `apply_price_change` tool "
-        "with the listing_id and the suggested new_price to update the database.\n\n"
-        "Return the tool result as-is in JSON format."
-    ),
+    instruction=PRICING_INSTRUCTION,
     tools=[analyze_pricing, apply_price_change],
 )
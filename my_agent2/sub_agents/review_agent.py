@@ -12,9 +12,192 @@ This agent analyzes customer reviews to provide insights on:
 This is a READ-ONLY agent - no actions can be taken.
 """
 
-from typing import Dict, Any, List
+from bisect import bisect_right
+from typing import Dict, Any, List, Union
+from collections import Counter
+from dataclasses import dataclass, asdict
 
-from ..database.api_db import api_db as db
+from ..database.api_db import api_db as db, Review
+from ..database.analysis_cache import Uncached, time_bucketed_cache
+
+
+# Returned when the reviews request fails
+REVIEWS_UNAVAILABLE_MESSAGE = "Could not load reviews for listing '{listing_id}'. Please try again shortly."
+
+# Satisfaction levels by average rating: below 3, from 3, and from 4 upwards
+SATISFACTION_THRESHOLDS = (3, 4)
+SATISFACTION_LEVELS = (
+    ("Dissatisfied", "😞"),
+    ("Neutral", "😐"),
+    ("Satisfied", "😊"),
+)
+
+# Overall sentiment by share of positive keyword mentions
+SENTIMENT_RATIO_THRESHOLDS = (0.3, 0.5, 0.7)
+SENTIMENT_LABELS = ("Mostly Negative", "Mixed", "Mostly Positive", "Very Positive")
+
+# Summary text; optional sections are empty when there is nothing to report
+SUMMARY_TEMPLATE = (
+    "Based on {total_reviews} reviews with an average rating of {avg_rating:.1f}/5.0, "
+    "the overall satisfaction is {level}. {issues}{praise}{action}"
+)
+SUMMARY_ISSUES_TEMPLATE = "Key issues found: {issues}. "
+SUMMARY_PRAISE_TEMPLATE = "Guests appreciate: {praise}. "
+SUMMARY_ACTION_TEMPLATE = "Priority action: {action}"
+NO_REVIEWS_SUMMARY_TEMPLATE = (
+    "No reviews have been submitted for '{title}' yet. "
+    "Focus on delivering great experiences to earn your first reviews."
+)
+
+# Keywords used for sentiment analysis on review text
+POSITIVE_KEYWORDS = (
+    "excellent", "great", "amazing", "perfect", "love", "wonderful", 
+    "clean", "comfortable", "quality", "recommend", "spotless", "good",
+    "friendly", "helpful", "responsive", "smooth", "easy", "best"
+)
+NEGATIVE_KEYWORDS = (
+    "dirty", "bad", "poor", "terrible", "worst", "disappointing",
+    "missing", "broken", "filthy", "uncomfortable", "awful", "slow",
+    "rude", "late", "damaged", "problem", "issue", "complaint"
+)
+
+# Keywords that mark each recurring theme
+THEME_DEFINITIONS = {
+    "Cleanliness": ("clean", "tidy", "spotless", "dirty", "filthy", "messy", "dust"),
+    "Comfort": ("comfortable", "cozy", "uncomfortable", "soft", "bed", "sleep"),
+    "Quality": ("quality", "excellent", "good", "poor", "bad", "condition"),
+    "Communication": ("responsive", "helpful", "communication", "quick", "slow", "friendly", "rude"),
+    "Value": ("worth", "value", "price", "expensive", "cheap", "affordable"),
+    "Location": ("location", "convenient", "accessible", "far", "near"),
+    "Amenities": ("amenities", "wifi", "parking", "pool", "kitchen", "missing")
+}
+
+# Keywords that point to a specific issue (low ratings) or praise (high ratings)
+ISSUE_KEYWORDS = {
+    "dirty": "cleanliness issue",
+    "filthy": "cleanliness issue", 
+    "messy": "cleanliness issue",
+    "dust": "dust accumulation",
+    "uncomfortable": "comfort issue",
+    "broken": "broken item/facility",
+    "missing": "missing item/amenity",
+    "slow": "slow response/service",
+    "rude": "staff/host attitude",
+    "expensive": "pricing concern",
+    "noisy": "noise issue",
+    "small": "space too small",
+    "old": "outdated facilities",
+    "smell": "odor issue",
+    "bug": "pest issue",
+    "leak": "water leak issue",
+    "cold": "temperature issue",
+    "hot": "temperature issue",
+    "wifi": "wifi/internet issue",
+    "parking": "parking issue",
+    "late": "late check-in/response"
+}
+
+PRAISE_KEYWORDS = {
+    "clean": "cleanliness",
+    "spotless": "excellent cleanliness",
+    "comfortable": "comfort",
+    "cozy": "cozy atmosphere",
+    "friendly": "friendly host",
+    "helpful": "helpful service",
+    "responsive": "quick response",
+    "great": "great experience",
+    "excellent": "excellent quality",
+    "perfect": "perfect stay",
+    "amazing": "amazing experience",
+    "recommend": "highly recommended",
+    "convenient": "convenient location",
+    "spacious": "spacious room",
+    "quiet": "peaceful environment",
+    "value": "good value"
+}
+
+# Every distinct keyword above, so each comment is scanned once per keyword
+# no matter how many groups share it. Issue and praise keywords come first,
+# in table order, so matches are reported in that order.
+_THEME_KEYWORDS = tuple(kw for keywords in THEME_DEFINITIONS.values() for kw in keywords)
+_ALL_KEYWORDS = tuple(dict.fromkeys((
+    *ISSUE_KEYWORDS,
+    *PRAISE_KEYWORDS,
+    *POSITIVE_KEYWORDS,
+    *NEGATIVE_KEYWORDS,
+    *_THEME_KEYWORDS,
+)))
+
+# Issue keywords only matter for 1-3 star reviews and praise keywords only for
+# 4-5 star reviews, so each rating band skips the other band's exclusive keywords
+_SHARED_KEYWORDS = frozenset((*POSITIVE_KEYWORDS, *NEGATIVE_KEYWORDS, *_THEME_KEYWORDS))
+_LOW_RATING_KEYWORDS = tuple(
+    kw for kw in _ALL_KEYWORDS if kw not in PRAISE_KEYWORDS or kw in _SHARED_KEYWORDS
+)
+_HIGH_RATING_KEYWORDS = tuple(
+    kw for kw in _ALL_KEYWORDS if kw not in ISSUE_KEYWORDS or kw in _SHARED_KEYWORDS
+)
+
+# Frozen per-group sets so each group is matched with one set operation
+_POSITIVE_KEYWORD_SET = frozenset(POSITIVE_KEYWORDS)
+_NEGATIVE_KEYWORD_SET = frozenset(NEGATIVE_KEYWORDS)
+
+# Reverse index from keyword to its theme; ISSUE_KEYWORDS and
+# PRAISE_KEYWORDS already map keywords to their descriptions
+_KEYWORD_TO_THEME = {
+    kw: theme for theme, keywords in THEME_DEFINITIONS.items() for kw in keywords
+}
+
+
+# Recommendation template for each issue description, filled with how many
+# reviews raised it
+_ISSUE_RECOMMENDATIONS = {
+    "cleanliness issue": "Cleanliness mentioned {count}x - Deep clean before each guest, consider professional cleaning service",
+    "dust accumulation": "Dust mentioned {count}x - Focus on dusting surfaces, air vents, and hidden areas",
+    "comfort issue": "Comfort mentioned {count}x - Upgrade mattress/pillows or add extra bedding options",
+    "broken item/facility": "Broken items mentioned {count}x - Inspect and repair/replace damaged items immediately",
+    "missing item/amenity": "Missing items mentioned {count}x - Check amenity checklist and restock essentials",
+    "slow response/service": "Slow response mentioned {count}x - Set up auto-replies and check messages more frequently",
+    "staff/host attitude": "Attitude mentioned {count}x - Focus on friendly, professional communication",
+    "pricing concern": "Pricing mentioned {count}x - Review your pricing or add more value/amenities",
+    "noise issue": "Noise mentioned {count}x - Provide earplugs or improve sound insulation",
+    "temperature issue": "Temperature mentioned {count}x - Check AC/heating system, provide fans or extra blankets",
+    "wifi/internet issue": "WiFi mentioned {count}x - Upgrade internet plan or add WiFi extenders",
+    "odor issue": "Odor mentioned {count}x - Deep clean carpets/fabrics, use air fresheners",
+    "pest issue": "Pest mentioned {count}x - Call pest control immediately",
+    "water leak issue": "Leak mentioned {count}x - Fix plumbing issues urgently",
+    "space too small": "Space mentioned {count}x - Update listing to set proper expectations about room size",
+    "outdated facilities": "Outdated facilities mentioned {count}x - Consider renovations or modernizing decor",
+    "parking issue": "Parking mentioned {count}x - Clarify parking situation in listing or provide alternatives",
+    "late check-in/response": "Late response mentioned {count}x - Use automated check-in or be more punctual",
+}
+
+
+@dataclass(slots=True)
+class ThemeStats:
+    """Review counts for a single recurring theme."""
+    count: int = 0
+    positive: int = 0
+    negative: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class ReviewResult:
+    """Review analysis for a listing, in the order it is reported."""
+    title: str
+    overall_satisfaction: Dict[str, Any]
+    total_reviews: int
+    rating_distribution: Dict[str, Dict[str, int]]
+    sentiment_analysis: Dict[str, Any]
+    recurring_themes: List[Dict[str, Any]]
+    key_insights: List[str]
+    recommendations: List[str]
+    summary: str
+
+
+def _find_keywords(comment: str, keywords: tuple) -> List[str]:
+    """Return the given keywords that occur in a lowercased comment, in order."""
+    return [kw for kw in keywords if kw in comment]
 
 
 def analyze_reviews(listing_id: str) -> Dict[str, Any]:
@@ -33,224 +216,151 @@ def analyze_reviews(listing_id: str) -> Dict[str, Any]:
     :param listing_id: Identifier of the listing to analyze
     :return: Dictionary with review analysis results
     """
-    reviews = db.get_reviews(listing_id)
-    listing = db.get_listing(listing_id)
+    result = _analyze_reviews_cached(listing_id)
+    
+    # Error dicts are built per call; cached results are shared, so copy them
+    return asdict(result) if isinstance(result, ReviewResult) else result
+
+
+@time_bucketed_cache()
+def _analyze_reviews_cached(listing_id: str) -> Union[ReviewResult, Uncached]:
+    """Fetch the listing's reviews and analyze them; errors are returned uncached."""
+    listing, reviews = db.get_listing_with_reviews(listing_id)
+    
+    # A failed reviews request must not read as a listing with no reviews
+    if reviews is None:
+        return Uncached({
+            "listing_id": listing_id,
+            "error": True,
+            "message": REVIEWS_UNAVAILABLE_MESSAGE.format(listing_id=listing_id)
+        })
     
-    listing_title = listing.title if listing else listing_id
+    if not listing:
+        # The listing may be new or its request may have failed; report the
+        # reviews under its ID, but look it up again on the next call
+        return Uncached(_build_review_analysis(listing_id, reviews))
     
+    return _build_review_analysis(listing.title, reviews)
+
+
+def _build_review_analysis(listing_title: str, reviews: List[Review]) -> ReviewResult:
+    """Compute the review analysis for a listing's reviews."""
     if not reviews:
-        return {
-            "title": f"Review Analysis for '{listing_title}'",
-            "overall_satisfaction": {
+        return ReviewResult(
+            title=f"Review Analysis for '{listing_title}'",
+            overall_satisfaction={
                 "level": "No Reviews",
                 "emoji": "❓",
                 "average_rating": None,
                 "max_rating": 5.0
             },
-            "total_reviews": 0,
-            "rating_distribution": {
+            total_reviews=0,
+            rating_distribution={
                 "5_star": {"count": 0, "percentage": 0},
                 "4_star": {"count": 0, "percentage": 0},
                 "3_star": {"count": 0, "percentage": 0},
                 "2_star": {"count": 0, "percentage": 0},
                 "1_star": {"count": 0, "percentage": 0}
             },
-            "sentiment_analysis": {
+            sentiment_analysis={
                 "overall": "No Data",
                 "positive_mentions": 0,
                 "negative_mentions": 0
             },
-            "recurring_themes": [],
-            "key_insights": ["No reviews available for analysis"],
-            "recommendations": [
+            recurring_themes=[],
+            key_insights=["No reviews available for analysis"],
+            recommendations=[
                 "Encourage your first guests to leave reviews",
                 "Offer excellent service to earn positive feedback",
                 "Follow up with guests after checkout to request reviews"
             ],
-            "summary": f"No reviews have been submitted for '{listing_title}' yet. Focus on delivering great experiences to earn your first reviews."
-        }
+            summary=NO_REVIEWS_SUMMARY_TEMPLATE.format(title=listing_title)
+        )
     
     # 1. Compute average rating and distribution
-    ratings = [r.rating for r in reviews]
-    avg_rating = sum(ratings) / len(ratings)
     total_reviews = len(reviews)
     
-    rating_distribution = {
-        "5_star": {"count": ratings.count(5), "percentage": (ratings.count(5) / total_reviews) * 100},
-        "4_star": {"count": ratings.count(4), "percentage": (ratings.count(4) / total_reviews) * 100},
-        "3_star": {"count": ratings.count(3), "percentage": (ratings.count(3) / total_reviews) * 100},
-        "2_star": {"count": ratings.count(2), "percentage": (ratings.count(2) / total_reviews) * 100},
-        "1_star": {"count": ratings.count(1), "percentage": (ratings.count(1) / total_reviews) * 100},
-    }
-    
-    # 2. Define satisfaction level
-    if avg_rating >= 4:
-        satisfaction_level = "Satisfied"
-        satisfaction_emoji = "😊"
-    elif avg_rating >= 3:
-        satisfaction_level = "Neutral"
-        satisfaction_emoji = "😐"
-    else:
-        satisfaction_level = "Dissatisfied"
-        satisfaction_emoji = "😞"
+    # Walk the reviews once, counting every star value alongside the text
+    # scan (3-4): sentiment keywords, theme mentions and specific issues/praise
+    rating_counts = Counter()
+    positive_mentions = 0
+    negative_mentions = 0
+    theme_stats = {theme: ThemeStats() for theme in THEME_DEFINITIONS}
+    issue_counts = {}
+    praise_counts = Counter()
     
-    # 3. Perform sentiment analysis on review text
-    positive_keywords = [
-        "excellent", "great", "amazing", "perfect", "love", "wonderful", 
-        "clean", "comfortable", "quality", "recommend", "spotless", "good",
-        "friendly", "helpful", "responsive", "smooth", "easy", "best"
-    ]
-    negative_keywords = [
-        "dirty", "bad", "poor", "terrible", "worst", "disappointing",
-        "missing", "broken", "filthy", "uncomfortable", "awful", "slow",
-        "rude", "late", "damaged", "problem", "issue", "complaint"
-    ]
+    for review in reviews:
+        comment = review.comment or ""
+        rating = review.rating
+        rating_counts[rating] += 1
+        found = _find_keywords(
+            review.comment_lower,
+            _LOW_RATING_KEYWORDS if rating <= 3 else _HIGH_RATING_KEYWORDS
+        )
+        
+        positive_mentions += len(_POSITIVE_KEYWORD_SET.intersection(found))
+        negative_mentions += len(_NEGATIVE_KEYWORD_SET.intersection(found))
+        
+        # Each theme counts once per review, however many of its keywords match
+        review_themes = {_KEYWORD_TO_THEME[kw] for kw in found if kw in _KEYWORD_TO_THEME}
+        for theme in review_themes:
+            stats = theme_stats[theme]
+            stats.count += 1
+            if rating >= 4:
+                stats.positive += 1
+            elif rating <= 2:
+                stats.negative += 1
+        
+        # Extract issues from low-rated reviews (1-3 stars)
+        # Several keywords can share one issue, so count each issue once per review
+        if rating <= 3:
+            review_issues = dict.fromkeys(
+                ISSUE_KEYWORDS[keyword] for keyword in found if keyword in ISSUE_KEYWORDS
+            )
+            for issue_desc in review_issues:
+                if issue_desc not in issue_counts:
+                    issue_counts[issue_desc] = {"count": 0, "examples": []}
+                issue_counts[issue_desc]["count"] += 1
+                # Keep max 2 examples; only build the excerpt when it is kept
+                examples = issue_counts[issue_desc]["examples"]
+                if len(examples) < 2:
+                    examples.append(comment[:100] + "..." if len(comment) > 100 else comment)
+        
+        # Extract praise from high-rated reviews (4-5 stars)
+        if rating >= 4:
+            review_praise = dict.fromkeys(
+                PRAISE_KEYWORDS[keyword] for keyword in found if keyword in PRAISE_KEYWORDS
+            )
+            for praise_desc in review_praise:
+                praise_counts[praise_desc] += 1
     
-    positive_mentions = []
-    negative_mentions = []
+    # The average is derived from the star counts, not a list of every rating
+    avg_rating = sum(star * count for star, count in rating_counts.items()) / total_reviews
     
-    for review in reviews:
-        comment = (review.comment or "").lower()
-        for word in positive_keywords:
-            if word in comment:
-                positive_mentions.append(word)
-        for word in negative_keywords:
-            if word in comment:
-                negative_mentions.append(word)
+    # 2. Define satisfaction level
+    satisfaction_level, satisfaction_emoji = SATISFACTION_LEVELS[
+        bisect_right(SATISFACTION_THRESHOLDS, avg_rating)
+    ]
     
-    total_sentiment_words = len(positive_mentions) + len(negative_mentions)
+    # 3. Perform sentiment analysis from the keyword mentions
+    total_sentiment_words = positive_mentions + negative_mentions
     if total_sentiment_words > 0:
-        positive_ratio = len(positive_mentions) / total_sentiment_words
-        if positive_ratio >= 0.7:
-            sentiment = "Very Positive"
-        elif positive_ratio >= 0.5:
-            sentiment = "Mostly Positive"
-        elif positive_ratio >= 0.3:
-            sentiment = "Mixed"
-        else:
-            sentiment = "Mostly Negative"
+        positive_ratio = positive_mentions / total_sentiment_words
+        sentiment = SENTIMENT_LABELS[bisect_right(SENTIMENT_RATIO_THRESHOLDS, positive_ratio)]
     else:
         sentiment = "Neutral"
     
     # 4. Identify recurring themes
-    theme_definitions = {
-        "Cleanliness": ["clean", "tidy", "spotless", "dirty", "filthy", "messy", "dust"],
-        "Comfort": ["comfortable", "cozy", "uncomfortable", "soft", "bed", "sleep"],
-        "Quality": ["quality", "excellent", "good", "poor", "bad", "condition"],
-        "Communication": ["responsive", "helpful", "communication", "quick", "slow", "friendly", "rude"],
-        "Value": ["worth", "value", "price", "expensive", "cheap", "affordable"],
-        "Location": ["location", "convenient", "accessible", "far", "near"],
-        "Amenities": ["amenities", "wifi", "parking", "pool", "kitchen", "missing"]
-    }
-    
-    theme_counts = {}
+    theme_counts = Counter()
     theme_sentiment = {}
     
-    for theme, keywords in theme_definitions.items():
-        count = 0
-        positive = 0
-        negative = 0
-        for review in reviews:
-            comment = (review.comment or "").lower()
-            if any(kw in comment for kw in keywords):
-                count += 1
-                if review.rating >= 4:
-                    positive += 1
-                elif review.rating <= 2:
-                    negative += 1
-        if count > 0:
-            theme_counts[theme] = count
-            theme_sentiment[theme] = "positive" if positive > negative else ("negative" if negative > positive else "mixed")
+    for theme, stats in theme_stats.items():
+        if stats.count > 0:
+            theme_counts[theme] = stats.count
+            theme_sentiment[theme] = "positive" if stats.positive > stats.negative else ("negative" if stats.negative > stats.positive else "mixed")
     
     # Sort themes by frequency
-    recurring_themes = sorted(theme_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-    
-    # Analyze individual reviews to extract specific issues and praise
-    specific_issues = []
-    specific_praise = []
-    
-    issue_keywords = {
-        "dirty": "cleanliness issue",
-        "filthy": "cleanliness issue", 
-        "messy": "cleanliness issue",
-        "dust": "dust accumulation",
-        "uncomfortable": "comfort issue",
-        "broken": "broken item/facility",
-        "missing": "missing item/amenity",
-        "slow": "slow response/service",
-        "rude": "staff/host attitude",
-        "expensive": "pricing concern",
-        "noisy": "noise issue",
-        "small": "space too small",
-        "old": "outdated facilities",
-        "smell": "odor issue",
-        "bug": "pest issue",
-        "leak": "water leak issue",
-        "cold": "temperature issue",
-        "hot": "temperature issue",
-        "wifi": "wifi/internet issue",
-        "parking": "parking issue",
-        "late": "late check-in/response"
-    }
-    
-    praise_keywords = {
-        "clean": "cleanliness",
-        "spotless": "excellent cleanliness",
-        "comfortable": "comfort",
-        "cozy": "cozy atmosphere",
-        "friendly": "friendly host",
-        "helpful": "helpful service",
-        "responsive": "quick response",
-        "great": "great experience",
-        "excellent": "excellent quality",
-        "perfect": "perfect stay",
-        "amazing": "amazing experience",
-        "recommend": "highly recommended",
-        "convenient": "convenient location",
-        "spacious": "spacious room",
-        "quiet": "peaceful environment",
-        "value": "good value"
-    }
-    
-    # Extract specific feedback from each review
-    for review in reviews:
-        comment = (review.comment or "").lower()
-        rating = review.rating
-        
-        # Extract issues from low-rated reviews (1-3 stars)
-        if rating <= 3:
-            for keyword, issue_desc in issue_keywords.items():
-                if keyword in comment:
-                    # Extract context around the keyword
-                    specific_issues.append({
-                        "issue": issue_desc,
-                        "rating": rating,
-                        "from_review": review.comment[:100] + "..." if len(review.comment or "") > 100 else review.comment
-                    })
-        
-        # Extract praise from high-rated reviews (4-5 stars)
-        if rating >= 4:
-            for keyword, praise_desc in praise_keywords.items():
-                if keyword in comment:
-                    specific_praise.append({
-                        "praise": praise_desc,
-                        "rating": rating
-                    })
-    
-    # Remove duplicates and count occurrences
-    issue_counts = {}
-    for item in specific_issues:
-        issue = item["issue"]
-        if issue not in issue_counts:
-            issue_counts[issue] = {"count": 0, "examples": []}
-        issue_counts[issue]["count"] += 1
-        if len(issue_counts[issue]["examples"]) < 2:  # Keep max 2 examples
-            issue_counts[issue]["examples"].append(item["from_review"])
-    
-    praise_counts = {}
-    for item in specific_praise:
-        praise = item["praise"]
-        praise_counts[praise] = praise_counts.get(praise, 0) + 1
+    recurring_themes = theme_counts.most_common(5)
     
     # Build key insights based on actual review content
     key_insights = []
@@ -258,7 +368,8 @@ def analyze_reviews(listing_id: str) -> Dict[str, Any]:
     
     # Sort issues by frequency
     sorted_issues = sorted(issue_counts.items(), key=lambda x: x[1]["count"], reverse=True)
-    sorted_praise = sorted(praise_counts.items(), key=lambda x: x[1], reverse=True)
+    # At most the top 3 praises are ever reported
+    sorted_praise = praise_counts.most_common(3)
     
     if satisfaction_level == "Satisfied":
         key_insights.append("Customers are highly satisfied with this listing")
@@ -280,43 +391,9 @@ def analyze_reviews(listing_id: str) -> Dict[str, Any]:
         
         # Generate specific recommendations based on actual issues
         for issue, data in sorted_issues[:5]:
-            count = data["count"]
-            if issue == "cleanliness issue":
-                recommendations.append(f"Cleanliness mentioned {count}x - Deep clean before each guest, consider professional cleaning service")
-            elif issue == "dust accumulation":
-                recommendations.append(f"Dust mentioned {count}x - Focus on dusting surfaces, air vents, and hidden areas")
-            elif issue == "comfort issue":
-                recommendations.append(f"Comfort mentioned {count}x - Upgrade mattress/pillows or add extra bedding options")
-            elif issue == "broken item/facility":
-                recommendations.append(f"Broken items mentioned {count}x - Inspect and repair/replace damaged items immediately")
-            elif issue == "missing item/amenity":
-                recommendations.append(f"Missing items mentioned {count}x - Check amenity checklist and restock essentials")
-            elif issue == "slow response/service":
-                recommendations.append(f"Slow response mentioned {count}x - Set up auto-replies and check messages more frequently")
-            elif issue == "staff/host attitude":
-                recommendations.append(f"Attitude mentioned {count}x - Focus on friendly, professional communication")
-            elif issue == "pricing concern":
-                recommendations.append(f"Pricing mentioned {count}x - Review your pricing or add more value/amenities")
-            elif issue == "noise issue":
-                recommendations.append(f"Noise mentioned {count}x - Provide earplugs or improve sound insulation")
-            elif issue == "temperature issue":
-                recommendations.append(f"Temperature mentioned {count}x - Check AC/heating system, provide fans or extra blankets")
-            elif issue == "wifi/internet issue":
-                recommendations.append(f"WiFi mentioned {count}x - Upgrade internet plan or add WiFi extenders")
-            elif issue == "odor issue":
-                recommendations.append(f"Odor mentioned {count}x - Deep clean carpets/fabrics, use air fresheners")
-            elif issue == "pest issue":
-                recommendations.append(f"Pest mentioned {count}x - Call pest control immediately")
-            elif issue == "water leak issue":
-                recommendations.append(f"Leak mentioned {count}x - Fix plumbing issues urgently")
-            elif issue == "space too small":
-                recommendations.append(f"Space mentioned {count}x - Update listing to set proper expectations about room size")
-            elif issue == "outdated facilities":
-                recommendations.append(f"Outdated facilities mentioned {count}x - Consider renovations or modernizing decor")
-            elif issue == "parking issue":
-                recommendations.append(f"Parking mentioned {count}x - Clarify parking situation in listing or provide alternatives")
-            elif issue == "late check-in/response":
-                recommendations.append(f"Late response mentioned {count}x - Use automated check-in or be more punctual")
+            template = _ISSUE_RECOMMENDATIONS.get(issue)
+            if template:
+                recommendations.append(template.format(count=data["count"]))
     
     # Add general recommendations if no specific issues found
     if not recommendations:
@@ -328,67 +405,71 @@ def analyze_reviews(listing_id: str) -> Dict[str, Any]:
             recommendations.append("Consider pausing bookings until issues are resolved")
     
     # Build summary text
-    summary = f"Based on {total_reviews} reviews with an average rating of {avg_rating:.1f}/5.0, "
-    summary += f"the overall satisfaction is {satisfaction_level}. "
-    
-    if sorted_issues:
-        summary += f"Key issues found: {', '.join([i[0] for i in sorted_issues[:3]])}. "
-    if sorted_praise:
-        summary += f"Guests appreciate: {', '.join([p[0] for p in sorted_praise[:2]])}. "
-    if recommendations:
-        summary += f"Priority action: {recommendations[0].split(' - ')[0] if ' - ' in recommendations[0] else recommendations[0]}"
+    summary = SUMMARY_TEMPLATE.format(
+        total_reviews=total_reviews,
+        avg_rating=avg_rating,
+        level=satisfaction_level,
+        issues=SUMMARY_ISSUES_TEMPLATE.format(
+            issues=", ".join(i[0] for i in sorted_issues[:3])
+        ) if sorted_issues else "",
+        praise=SUMMARY_PRAISE_TEMPLATE.format(
+            praise=", ".join(p[0] for p in sorted_praise[:2])
+        ) if sorted_praise else "",
+        action=SUMMARY_ACTION_TEMPLATE.format(
+            action=recommendations[0].partition(" - ")[0]
+        ) if recommendations else ""
+    )
     
-    # Return clean JSON structure in exact sequence
-    return {
-        "title": f"Review Analysis for '{listing_title}'",
-        "overall_satisfaction": {
+    return ReviewResult(
+        title=f"Review Analysis for '{listing_title}'",
+        overall_satisfaction={
             "level": satisfaction_level,
             "emoji": satisfaction_emoji,
             "average_rating": round(avg_rating, 1),
             "max_rating": 5.0
         },
-        "total_reviews": total_reviews,
-        "rating_distribution": {
-            "5_star": {"count": rating_distribution["5_star"]["count"], "percentage": round(rating_distribution["5_star"]["percentage"])},
-            "4_star": {"count": rating_distribution["4_star"]["count"], "percentage": round(rating_distribution["4_star"]["percentage"])},
-            "3_star": {"count": rating_distribution["3_star"]["count"], "percentage": round(rating_distribution["3_star"]["percentage"])},
-            "2_star": {"count": rating_distribution["2_star"]["count"], "percentage": round(rating_distribution["2_star"]["percentage"])},
-            "1_star": {"count": rating_distribution["1_star"]["count"], "percentage": round(rating_distribution["1_star"]["percentage"])}
+        total_reviews=total_reviews,
+        rating_distribution={
+            f"{star}_star": {"count": rating_counts[star], "percentage": round((rating_counts[star] / total_reviews) * 100)}
+            for star in (5, 4, 3, 2, 1)
         },
-        "sentiment_analysis": {
+        sentiment_analysis={
             "overall": sentiment,
-            "positive_mentions": len(positive_mentions),
-            "negative_mentions": len(negative_mentions)
+            "positive_mentions": positive_mentions,
+            "negative_mentions": negative_mentions
         },
-        "recurring_themes": [
+        recurring_themes=[
             {
                 "theme": t,
                 "mention_count": c,
                 "sentiment": theme_sentiment.get(t, "neutral")
             } for t, c in recurring_themes
         ],
-        "key_insights": key_insights,
-        "recommendations": recommendations,
-        "summary": summary
-    }
+        key_insights=key_insights,
+        recommendations=recommendations,
+        summary=summary
+    )
 
 
+# Prompt for the ReviewAnalysisAgent
+REVIEW_INSTRUCTION = (
+    "You are a customer review analysis specialist. Your role is to analyze customer feedback for rental listings.\n\n"
+    "When responding to a query:\n"
+    "1. If the listing ID is not provided, ask the user for it.\n"
+    "2. Use the `analyze_reviews` tool to get the review analytics.\n"
+    "3. Return ONLY the JSON object from the tool result - do not wrap it in another object.\n"
+    "4. Do not add any text before or after the JSON.\n"
+    "5. Do not use markdown code blocks.\n\n"
+    "Example output format:\n"
+    '{"listing_id": "...", "listing_title": "...", "total_reviews": 10, ...}\n\n'
+    "This is a read-only agent. Return the tool result as-is without modification."
+)
+
 # Create the ReviewAnalysisAgent LLM agent
 review_agent = LlmAgent(
     model="gemini-2.5-flash",
     name="ReviewAnalysisAgent",
     description="Analyzes customer reviews to provide satisfaction levels, rating distributions, sentiment analysis, and recurring themes in JSON format.",
-    instruction=(
-        "You are a customer review analysis specialist. Your role is to analyze customer feedback for rental listings.\n\n"
-        "When responding to a query:\n"
-        "1. If the listing ID is not provided, ask the user for it.\n"
-        "2. Use the `analyze_reviews` tool to get the review analytics.\n"
-        "3. Return ONLY the JSON object from the tool result - do not wrap it in another object.\n"
-        "4. Do not add any text before or after the JSON.\n"
-        "5. Do not use markdown code blocks.\n\n"
-        "Example output format:\n"
-        '{"listing_id": "...", "listing_title": "...", "total_reviews": 10, ...}\n\n'
-        "This is a read-only agent. Return the tool result as-is without modification."
-    ),
+    instruction=REVIEW_INSTRUCTION,
     tools=[analyze_reviews],
 )